@@ -1,13 +1,20 @@
 import os
-import json
-from flask import Flask, jsonify, render_template, request, abort, make_response, redirect, url_for
+import gzip
+import hashlib
+import brotli
+import orjson
+import msgspec
+from flask import Flask, Response, jsonify, render_template, request, abort, make_response, redirect, url_for
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from google.oauth2.service_account import Credentials
 import threading
 import time
+import queue
 import jwt
 from datetime import datetime, timedelta
-from functools import wraps
+from functools import lru_cache, wraps
 
 # --- Configuration ---
 # Google Sheet details
@@ -25,18 +32,76 @@ INVALIDATE_TOKEN = os.environ.get("INVALIDATE_TOKEN", "your-secret-token")
 
 # JWT Configuration
 JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "a-super-secret-key-that-is-long-and-secure")
-AUTHORIZED_EMAILS = [
+# frozenset for O(1) membership tests; checked on every authenticated request
+AUTHORIZED_EMAILS = frozenset({
     "admin@example.com",
     "user1@example.com",
     "test@example.com"
-]
+})
 
 
 # --- Flask App Initialization ---
+
+class ORJSONProvider(JSONProvider):
+    """JSON provider backed by orjson, so jsonify() uses the fast Rust encoder."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# Compress JSON responses on the fly (the cached listing bytes are
+# compressed once at cache-build time instead, see below).
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_LEVEL'] = 4
+app.config['COMPRESS_MIN_SIZE'] = 512
+# Leave streamed responses alone; /api/products streams pre-compressed bytes
+app.config['COMPRESS_STREAMS'] = False
+Compress(app)
+
+def _chunked(buf, n=65536):
+    """Yields buf in n-byte slices so WSGI streams it to the socket instead
+    of holding a second full copy of the payload in the response buffer."""
+    return (buf[i:i + n] for i in range(0, len(buf), n))
+
+def _json_response(data, status=200):
+    """Builds a JSON response directly from orjson bytes, skipping the
+    bytes -> str -> bytes round-trip that jsonify() incurs."""
+    return Response(orjson.dumps(data), status=status, mimetype='application/json')
 
 # --- Authentication ---
 
+# Cache of successfully verified tokens: blake2b(token) -> (email, exp).
+# A session re-sends the same cookie on every request, so after the first
+# full HMAC verification the rest become a dict lookup. Entries expire
+# with the token; the size cap evicts oldest-first.
+_jwt_cache = {}
+_jwt_cache_lock = threading.Lock()
+JWT_CACHE_MAX_ENTRIES = 10000
+
+def _verify_token(token):
+    """
+    Verifies a JWT and returns its email claim, consulting the decode
+    cache first. Raises the usual jwt exceptions on bad/expired tokens.
+    """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    hit = _jwt_cache.get(key)
+    if hit is not None and hit[1] > time.time():
+        return hit[0]
+    data = jwt.decode(token, JWT_SECRET_KEY, algorithms=["HS256"])
+    email = data['email']
+    exp = data.get('exp')
+    if exp:
+        with _jwt_cache_lock:
+            if len(_jwt_cache) >= JWT_CACHE_MAX_ENTRIES:
+                _jwt_cache.pop(next(iter(_jwt_cache)))
+            _jwt_cache[key] = (email, exp)
+    return email
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -44,8 +109,9 @@ def token_required(f):
         if not token:
             return redirect(url_for('login'))
         try:
-            data = jwt.decode(token, JWT_SECRET_KEY, algorithms=["HS256"])
-            current_user_email = data['email']
+            current_user_email = _verify_token(token)
+            # Authorization is checked on every request (never cached) so
+            # removing an email takes effect immediately.
             if current_user_email not in AUTHORIZED_EMAILS:
                 return render_template('unauthorized.html'), 403
         except jwt.ExpiredSignatureError:
@@ -56,14 +122,73 @@ def token_required(f):
         return f(current_user_email, *args, **kwargs)
     return decorated
 
+# --- Google Sheets Client ---
+SCOPE = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive']
+# The authorized client and opened spreadsheet are created once and reused;
+# re-authorizing per call costs a keyfile read, an RSA parse and an OAuth
+# token exchange every time.
+_gs_client = None
+_spreadsheet = None
+_gs_lock = threading.Lock()
+
+def get_gspread_client():
+    """Returns the process-wide authorized gspread client, creating it once."""
+    global _gs_client
+    with _gs_lock:
+        if _gs_client is None:
+            creds = Credentials.from_service_account_file(CREDENTIALS_FILE, scopes=SCOPE)
+            _gs_client = gspread.authorize(creds)
+        return _gs_client
+
+def get_spreadsheet():
+    """Returns the cached spreadsheet handle, opening it on first use."""
+    global _spreadsheet
+    client = get_gspread_client()
+    with _gs_lock:
+        if _spreadsheet is None:
+            _spreadsheet = client.open(SHEET_NAME)
+        return _spreadsheet
+
+# Cached header row of the products sheet. It only changes on schema
+# edits, so fetching it per insert is a wasted round-trip.
+_header_cache = None
+_header_lock = threading.Lock()
+
+def get_product_header(refresh=False):
+    """Returns the products-sheet header row, cached across requests."""
+    global _header_cache
+    with _header_lock:
+        if _header_cache is None or refresh:
+            _header_cache = get_spreadsheet().sheet1.row_values(1)
+        return _header_cache
+
 # --- Caching ---
-# In-memory cache for product data
-products_cache = None
-# A lock to ensure thread-safe access to the cache
+# The cache is read-mostly: it is only replaced on invalidation. Instead of
+# taking a lock on every read, the whole cache (product list plus all the
+# projections derived from it) lives in one immutable snapshot dict that is
+# published by a single assignment into _cache_ref[0] — an atomic pointer
+# store in CPython. Readers do a plain load with no lock; only the fill and
+# invalidate paths take cache_lock (classic RCU-style publish).
+#
+# Snapshot keys: 'version', 'header', 'rows', 'columns', 'thumbnails',
+# 'detail_json', 'json_bytes', 'etag', 'gz_bytes', 'br_bytes'.
+_cache_ref = [None]
+# Serializes cache fills and invalidations; never taken on the read path
 cache_lock = threading.Lock()
-# File-based cache for persistence
-LOCAL_CACHE_FILE = 'products_cache.json'
-MAX_LOCAL_CACHE_ITEMS = 10
+# Single-flight guard: set while a fetch is in progress so concurrent
+# cold-cache callers wait for the one in-flight fetch instead of piling
+# up behind cache_lock for the duration of a Sheets round-trip.
+_fetch_event = None
+# Monotonic version bumped on every invalidation. Folded into the ETag so
+# cached clients and CDNs revalidate immediately after a write.
+_cache_version = 0
+
+# Cache policy for the read-only product endpoints: short edge/browser
+# caching with revalidation, since data only changes on admin action
+PRODUCT_CACHE_CONTROL = 'public, max-age=60, stale-while-revalidate=300'
+# File-based cache for persistence (MessagePack: far faster than JSON to
+# encode/decode and smaller on disk, so the full catalog can be stored)
+LOCAL_CACHE_FILE = 'products_cache.msgpack'
 
 def setup_sheets():
     """
@@ -72,10 +197,7 @@ def setup_sheets():
     """
     try:
         print("Performing initial sheet setup check...")
-        scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-        creds = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_FILE, scope)
-        client = gspread.authorize(creds)
-        spreadsheet = client.open(SHEET_NAME)
+        spreadsheet = get_spreadsheet()
 
         # 1. Ensure 'audit_log' sheet exists
         try:
@@ -93,8 +215,13 @@ def setup_sheets():
             print("Adding 'Added By' column to products sheet...")
             # Find the first empty column in the header row and add it there
             product_sheet.update_cell(1, len(header) + 1, 'Added By')
+            header = header + ['Added By']
         else:
             print("'Added By' column already exists.")
+        # Seed the header cache so the first insert skips the extra fetch
+        global _header_cache
+        with _header_lock:
+            _header_cache = header
         print("Sheet setup check complete.")
         return True
     except Exception as e:
@@ -102,34 +229,65 @@ def setup_sheets():
         print("Please ensure the service account has editor permissions for the Google Sheet.")
         return False
 
+# --- Audit Logging ---
+# Audit rows are written by a background worker so requests never block on
+# the Sheets round-trip. The worker drains the queue in batches and lands
+# them with a single append_rows call, amortizing the API cost.
+_audit_q = queue.Queue(maxsize=10000)
+_audit_worker_started = False
+_audit_worker_lock = threading.Lock()
+AUDIT_BATCH_SIZE = 50
+
+def _audit_worker():
+    """Drains queued audit rows and appends them to the sheet in batches."""
+    while True:
+        batch = [_audit_q.get()]
+        while len(batch) < AUDIT_BATCH_SIZE:
+            try:
+                batch.append(_audit_q.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            audit_sheet = get_spreadsheet().worksheet('audit_log')
+            audit_sheet.append_rows(batch)
+        except Exception as e:
+            print(f"Error writing to audit log: {e}")
+
+def _ensure_audit_worker():
+    """Starts the audit worker on first use. Lazy so each Gunicorn worker
+    process gets its own thread (threads don't survive the preload fork)."""
+    global _audit_worker_started
+    if _audit_worker_started:
+        return
+    with _audit_worker_lock:
+        if not _audit_worker_started:
+            threading.Thread(target=_audit_worker, daemon=True).start()
+            _audit_worker_started = True
+
 def log_to_audit_sheet(user, action, details):
-    """Appends a log entry to the 'audit_log' sheet."""
+    """Queues a log entry for the 'audit_log' sheet; written in the background."""
+    timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+    _ensure_audit_worker()
     try:
-        scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-        creds = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_FILE, scope)
-        client = gspread.authorize(creds)
-        audit_sheet = client.open(SHEET_NAME).worksheet('audit_log')
-
-        timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
-        log_row = [timestamp, user, action, details]
-
-        audit_sheet.append_row(log_row)
+        _audit_q.put_nowait([timestamp, user, action, details])
         return True
-    except Exception as e:
-        print(f"Error writing to audit log: {e}")
+    except queue.Full:
+        print("Audit queue is full; dropping audit entry.")
         return False
 
 def get_products_from_sheet():
     """
-    Fetches product data from the Google Sheet.
+    Fetches product data from the Google Sheet as raw rows. Returns a dict
+    with the header row and the data rows (list-of-lists); keeping rows as
+    compact lists instead of per-row dicts halves memory and avoids N*cols
+    dict lookups when projections are built.
     """
-    try:        
-        scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-        creds = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_FILE, scope)
-        client = gspread.authorize(creds)
-        sheet = client.open(SHEET_NAME).sheet1
-        products = sheet.get_all_records() # Assumes first row is header
-        return products
+    try:
+        sheet = get_spreadsheet().sheet1
+        values = sheet.get_all_values() # First row is the header
+        if not values:
+            return {"header": [], "rows": []}
+        return {"header": values[0], "rows": values[1:]}
     except Exception as e:
         print(f"Error fetching data from Google Sheet: {e}")
         print(f"Error type: {type(e).__name__}")
@@ -146,13 +304,10 @@ def add_product_to_sheet(product_data):
     Appends a new product row to the Google Sheet.
     """
     try:
-        scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-        creds = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_FILE, scope)
-        client = gspread.authorize(creds)
-        sheet = client.open(SHEET_NAME).sheet1
+        sheet = get_spreadsheet().sheet1
 
-        # Get header row to ensure correct order
-        header = sheet.row_values(1)
+        # Get header row (cached) to ensure correct order
+        header = get_product_header()
         # Create a new row with values in the correct order, handling missing keys
         new_row = [product_data.get(h, "") for h in header]
 
@@ -160,36 +315,166 @@ def add_product_to_sheet(product_data):
         return True
     except Exception as e:
         print(f"Error adding product to Google Sheet: {e}")
-        return False
+        # The cached header may have gone stale after a sheet schema
+        # change; refresh it once and retry the append.
+        try:
+            header = get_product_header(refresh=True)
+            new_row = [product_data.get(h, "") for h in header]
+            get_spreadsheet().sheet1.append_row(new_row)
+            return True
+        except Exception as retry_error:
+            print(f"Error adding product after header refresh: {retry_error}")
+            return False
 
 def load_products_from_local_cache():
-    """Loads products from the local JSON file cache."""
-    if os.path.exists(LOCAL_CACHE_FILE):
-        with open(LOCAL_CACHE_FILE, 'r') as f:
-            return json.load(f)
-    return None
-
-def save_products_to_local_cache(products):
-    """Saves a subset of products to the local JSON file cache."""
-    with open(LOCAL_CACHE_FILE, 'w') as f:
-        json.dump(products[:MAX_LOCAL_CACHE_ITEMS], f)
-
-def get_products():
+    """Loads the raw sheet data from the local MessagePack file cache."""
+    # EAFP: opening directly avoids an extra stat and the race where the
+    # file is removed (by invalidation) between an exists() check and open
+    try:
+        with open(LOCAL_CACHE_FILE, 'rb') as f:
+            return msgspec.msgpack.decode(f.read())
+    except FileNotFoundError:
+        return None
+
+def save_products_to_local_cache(sheet_data):
+    """Saves the raw sheet data to the local MessagePack file cache."""
+    with open(LOCAL_CACHE_FILE, 'wb') as f:
+        f.write(msgspec.msgpack.encode(sheet_data))
+
+# Sheet columns the API projects, keyed by their API field names
+PRODUCT_COLUMNS = {
+    "name": "Name",
+    "image_url": "Image URL",
+    "purchase_link": "Purchase Link",
+    "description": "Description",
+    "tags": "Tags"
+}
+
+def _cell(row, index):
+    """Returns the cell at index, or None if the column is missing or the row is short."""
+    if index is None or index >= len(row):
+        return None
+    return row[index]
+
+def build_cache_snapshot(sheet_data):
     """
-    Gets product data, using the cache if available.
-    Reloads the cache from the Google Sheet if it's empty.
+    Builds an immutable cache snapshot from the raw sheet data: resolved
+    column indices, the listing projection, its serialized JSON bytes, the
+    derived ETag and the pre-compressed variants. Pure function; the
+    caller publishes it.
     """
-    global products_cache
-    with cache_lock:
-        if products_cache is None:
+    header = sheet_data["header"]
+    rows = sheet_data["rows"]
+    # Resolve column titles to indices once, so row access is plain indexing
+    columns = {key: header.index(title) if title in header else None
+               for key, title in PRODUCT_COLUMNS.items()}
+    name_i = columns["name"]
+    img_i = columns["image_url"]
+    link_i = columns["purchase_link"]
+    desc_i = columns["description"]
+    tags_i = columns["tags"]
+    thumbnails = [
+        {
+            "id": i,
+            "name": _cell(r, name_i),
+            "thumbnail_url": _cell(r, img_i),
+            "purchase_link": _cell(r, link_i)
+        } for i, r in enumerate(rows)
+    ]
+    # Each product's detail payload is a pure function of its row, so the
+    # serialized bytes are built here and the detail endpoint just indexes
+    detail_json = []
+    for i, r in enumerate(rows):
+        tags = _cell(r, tags_i) or ""
+        detail_json.append(orjson.dumps({
+            "id": i,
+            "name": _cell(r, name_i),
+            "image_url": _cell(r, img_i),
+            "purchase_link": _cell(r, link_i),
+            "description": _cell(r, desc_i),
+            "tags": [tag.strip() for tag in tags.split(',') if tag.strip()]
+        }))
+    json_bytes = orjson.dumps(thumbnails)
+    etag = f"{_cache_version}-{hashlib.blake2b(json_bytes, digest_size=8).hexdigest()}"
+    gz_bytes = None
+    br_bytes = None
+    if len(json_bytes) >= app.config['COMPRESS_MIN_SIZE']:
+        gz_bytes = gzip.compress(json_bytes, compresslevel=4)
+        br_bytes = brotli.compress(json_bytes, quality=4)
+    return {
+        "version": _cache_version,
+        "header": header,
+        "rows": rows,
+        "columns": columns,
+        "thumbnails": thumbnails,
+        "detail_json": detail_json,
+        "json_bytes": json_bytes,
+        "etag": etag,
+        "gz_bytes": gz_bytes,
+        "br_bytes": br_bytes
+    }
+
+def get_cache_snapshot():
+    """
+    Returns the published cache snapshot, filling it from the local cache
+    or the Google Sheet if it is empty. The hot path is a single lock-free
+    load of _cache_ref[0]. On a cold cache exactly one caller performs the
+    fetch (single-flight); everyone else waits on its event so the Sheets
+    API sees one request instead of a thundering herd. A fill that raced
+    an invalidation is discarded and retried rather than published.
+    """
+    global _fetch_event
+    snapshot = _cache_ref[0]
+    if snapshot is not None:
+        return snapshot
+
+    while True:
+        with cache_lock:
+            snapshot = _cache_ref[0]
+            if snapshot is not None:
+                return snapshot
+            event = _fetch_event
+            if event is None:
+                _fetch_event = threading.Event()
+                # Remember which cache generation this fetch is for, so a
+                # result that raced an invalidation is never published
+                fetch_version = _cache_version
+
+        if event is not None:
+            # Another thread is already fetching; wait for it to publish.
+            event.wait(timeout=10)
+            return _cache_ref[0]
+
+        published = False
+        try:
             print("Cache is empty. Attempting to load from local cache first.")
-            products_cache = load_products_from_local_cache()
-            if products_cache is None:
-                 print("Local cache is empty or not found. Fetching from Google Sheet.")
-                 products_cache = get_products_from_sheet()
-                 if products_cache:
-                     save_products_to_local_cache(products_cache)
-        return products_cache
+            from_sheet = False
+            sheet_data = load_products_from_local_cache()
+            if sheet_data is None:
+                print("Local cache is empty or not found. Fetching from Google Sheet.")
+                sheet_data = get_products_from_sheet()
+                from_sheet = True
+            if sheet_data is not None:
+                snapshot = build_cache_snapshot(sheet_data)
+                with cache_lock:
+                    # Publish (and persist) only if no invalidation bumped
+                    # the version while the fetch was in flight; stale data
+                    # must neither be republished nor written back to the
+                    # local cache file that invalidation just deleted.
+                    if _cache_version == fetch_version:
+                        _cache_ref[0] = snapshot
+                        if from_sheet:
+                            save_products_to_local_cache(sheet_data)
+                        published = True
+        finally:
+            with cache_lock:
+                _fetch_event.set()
+                _fetch_event = None
+
+        if published or sheet_data is None:
+            return _cache_ref[0]
+        # The fetch raced an invalidation and was discarded; go again
+        # under the new version.
 
 # --- Flask Routes ---
 
@@ -202,40 +487,68 @@ def index():
 def api_products():
     """API endpoint to get the list of all products."""
     # This will trigger a cache refresh if the cache is empty
-    products = get_products()
-    if products is None:
-        return jsonify({"error": "Could not retrieve product data."}), 500
+    snapshot = get_cache_snapshot()
+    if snapshot is None:
+        return _json_response({"error": "Could not retrieve product data."}, 500)
+
+    # The listing page only needs thumbnails, name, and links. That
+    # projection is precomputed and serialized at cache-load time, so the
+    # hot path is just handing the cached bytes to the Response.
+    # Repeat clients with a matching ETag get a body-less 304 instead.
+    # werkzeug handles entity-tag quoting, weak tags and tag lists.
+    if request.if_none_match.contains_weak(snapshot["etag"]):
+        response = Response(status=304, headers={'Cache-Control': PRODUCT_CACHE_CONTROL})
+        response.set_etag(snapshot["etag"])
+        return response
 
-    # The listing page only needs thumbnails, name, and links.
-    # The 'id' will be the row index + 2 (for header and 0-indexing)
-    # or we can just use the index in the list as an ID.
-    thumbnails = [
-        {
-            "id": i,
-            "name": p.get("Name"),
-            "thumbnail_url": p.get("Image URL"), # Assuming the same URL is used for thumbnail and full image
-            "purchase_link": p.get("Purchase Link")
-        } for i, p in enumerate(products)
-    ]
-    return jsonify(thumbnails)
+    # Serve a pre-compressed variant when the client accepts one; setting
+    # Content-Encoding here makes Flask-Compress leave the response alone.
+    body = snapshot["json_bytes"]
+    headers = {
+        'Cache-Control': PRODUCT_CACHE_CONTROL,
+        'Vary': 'Accept-Encoding'
+    }
+    if snapshot["br_bytes"] is not None and 'br' in request.accept_encodings:
+        body = snapshot["br_bytes"]
+        headers['Content-Encoding'] = 'br'
+    elif snapshot["gz_bytes"] is not None and 'gzip' in request.accept_encodings:
+        body = snapshot["gz_bytes"]
+        headers['Content-Encoding'] = 'gzip'
+    # Stream the body in chunks so large catalogs don't get copied whole
+    # into the response buffer; the length is known up front.
+    headers['Content-Length'] = str(len(body))
+    response = Response(_chunked(body), mimetype='application/json', headers=headers)
+    response.set_etag(snapshot["etag"])
+    return response
+
+@lru_cache(maxsize=4096)
+def _detail_for(product_id, version):
+    """
+    Returns the pre-serialized detail bytes for (id, cache version), or
+    None when the id is out of range. Keying by version means invalidation
+    simply changes the key; stale entries age out of the LRU on their own.
+    """
+    snapshot = _cache_ref[0]
+    if snapshot is None or snapshot["version"] != version:
+        return None
+    if product_id >= len(snapshot["detail_json"]):
+        return None
+    return snapshot["detail_json"][product_id]
 
 @app.route('/api/products/<int:product_id>')
 def api_product_detail(product_id):
     """API endpoint to get the details of a single product."""
-    products = get_products()
-    if products is None or product_id >= len(products):
-        return jsonify({"error": "Product not found."}), 404
-
-    product = products[product_id]
-    product_details = {
-        "id": product_id,
-        "name": product.get("Name"),
-        "image_url": product.get("Image URL"),
-        "purchase_link": product.get("Purchase Link"),
-        "description": product.get("Description"),
-        "tags": [tag.strip() for tag in product.get("Tags", "").split(',') if tag.strip()]
-    }
-    return jsonify(product_details)
+    snapshot = get_cache_snapshot()
+    if snapshot is None:
+        return _json_response({"error": "Product not found."}, 404)
+
+    # The detail payload is pre-serialized at cache-build time; repeat
+    # hits resolve through the LRU without touching the snapshot at all
+    blob = _detail_for(product_id, snapshot["version"])
+    if blob is None:
+        return _json_response({"error": "Product not found."}, 404)
+    return Response(blob, mimetype='application/json',
+                    headers={'Cache-Control': PRODUCT_CACHE_CONTROL})
 
 @app.route('/api/invalidate-cache')
 def invalidate_cache():
@@ -247,16 +560,22 @@ def invalidate_cache():
     if token != INVALIDATE_TOKEN:
         abort(403) # Forbidden
 
-    global products_cache
+    global _cache_version
     with cache_lock:
         print("Invalidating cache by request.")
-        products_cache = None # Set cache to None to force a reload on next request
+        # Unpublish the snapshot to force a reload on next request; bump
+        # the version so the rebuilt snapshot gets a fresh ETag
+        _cache_ref[0] = None
+        _cache_version += 1
         # Optionally, clear the local file cache as well
-        if os.path.exists(LOCAL_CACHE_FILE):
-            os.remove(LOCAL_CACHE_FILE)
+        try:
+            os.unlink(LOCAL_CACHE_FILE)
+        except FileNotFoundError:
+            pass
 
-    # Trigger a reload immediately in the background
-    threading.Thread(target=get_products).start()
+    # Trigger a reload immediately in the background; the single-flight
+    # guard coalesces this with any concurrent request-driven fill.
+    threading.Thread(target=get_cache_snapshot, daemon=True).start()
 
     return jsonify({"message": "Cache invalidated. Reloading in the background."})
 
@@ -300,7 +619,10 @@ def api_login():
 def add_product_page(current_user_email):
     """Serves the page for adding a new product."""
     # The current_user_email is passed by the decorator, you can use it if needed
-    return render_template('add_product.html')
+    response = make_response(render_template('add_product.html'))
+    # Admin pages must never be cached by intermediaries
+    response.headers['Cache-Control'] = 'no-store'
+    return response
 
 @app.route('/api/products/add', methods=['POST'])
 @token_required
@@ -317,7 +639,7 @@ def api_add_product(current_user_email):
     print(f"User '{current_user_email}' is adding a new product: {product_name}")
 
     if add_product_to_sheet(product_data):
-        # Log the audit event
+        # Queue the audit event; it is written by the background worker
         log_to_audit_sheet(
             user=current_user_email,
             action="ADD_PRODUCT",
@@ -325,14 +647,17 @@ def api_add_product(current_user_email):
         )
 
         # Invalidate cache after adding a new product
-        global products_cache
+        global _cache_version
         with cache_lock:
-            products_cache = None
-            if os.path.exists(LOCAL_CACHE_FILE):
-                os.remove(LOCAL_CACHE_FILE)
+            _cache_ref[0] = None
+            _cache_version += 1
+            try:
+                os.unlink(LOCAL_CACHE_FILE)
+            except FileNotFoundError:
+                pass
 
-        # Trigger a reload in the background
-        threading.Thread(target=get_products).start()
+        # Trigger a reload in the background (coalesced by single-flight)
+        threading.Thread(target=get_cache_snapshot, daemon=True).start()
 
         return jsonify({"message": "Product added successfully."}), 201
     else:
@@ -343,10 +668,11 @@ if __name__ == '__main__':
     # Validate required configuration
     if not SHEET_NAME or SHEET_NAME.strip() == "":
         raise ValueError("SHEET_NAME environment variable must be set and cannot be empty")
-    
+
     # Perform one-time setup of the Google Sheets
     setup_sheets()
-    # The `get_products` call will pre-load the cache on startup.
-    # get_products() # Disabled pre-loading to prevent potential startup crash
-    # In a production environment, use a proper WSGI server like Gunicorn or uWSGI.
+    # Development fallback only: the single-threaded dev server serializes
+    # every request. In production run via Gunicorn, which also does the
+    # sheet setup and cache warm-up in its master process:
+    #     gunicorn -c gunicorn.conf.py app.main:app
     app.run(debug=True)
@@ -0,0 +1,34 @@
+import os
+
+# Gunicorn configuration for the product lister.
+#
+# The app is I/O-bound (Sheets round-trips), so threaded workers let a
+# single process overlap many requests while the in-memory cache is
+# shared across its threads.
+workers = 2 * (os.cpu_count() or 1)
+threads = 4
+worker_class = 'gthread'
+
+# Import the app once in the master before forking, so the warmed-up
+# module state (sheet client, product cache) is copy-on-write shared
+# across workers instead of rebuilt per worker.
+preload_app = True
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+
+
+def on_starting(server):
+    """Runs sheet setup and warms the product cache in the master process."""
+    from app.main import setup_sheets, get_cache_snapshot
+    setup_sheets()
+    get_cache_snapshot()
+
+
+def post_fork(server, worker):
+    """Drops the Sheets client inherited from the master so each worker
+    re-authorizes with its own connections. Forked workers sharing the
+    master's pooled TLS sockets would interleave concurrent writes on one
+    connection and corrupt the session."""
+    import app.main
+    app.main._gs_client = None
+    app.main._spreadsheet = None